@@ -1,38 +1,267 @@
+import builtins
 import click
+import contextlib
+import functools
+import importlib.util
+import io
+import json
 import logging
 import os
-from kubernetes import client, config
-from kubernetes.client.rest import ApiException
-from kubernetes.config import ConfigException
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import MemoryHandler, RotatingFileHandler
 
 log_file = "sre_cli.log"
-try:
-    open(log_file, 'a').close()
-    os.chmod(log_file, 0o666)
-except Exception:
-    pass
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """Opens the log file with mode 0666 so every user of the CLI can append to it."""
+
+    def _open(self):
+        stream = super()._open()
+        try:
+            if stat.S_IMODE(os.fstat(stream.fileno()).st_mode) != 0o666:
+                os.chmod(self.baseFilename, 0o666)
+        except OSError:
+            pass
+        return stream
+
+    def emit_batch(self, records):
+        records = [record for record in records if self.filter(record)]
+        if not records:
+            return
+        self.acquire()
+        try:
+            text = "".join(self.format(record) + self.terminator for record in records)
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() and self.stream.tell() + len(text) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(text)
+            self.stream.flush()
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+
+class BatchMemoryHandler(MemoryHandler):
+    """Hands the whole buffer to the target at once, MemoryHandler.flush() writes record by record."""
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target and self.buffer:
+                self.target.emit_batch(self.buffer)
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+log_handler = SharedRotatingFileHandler(log_file, maxBytes=10_000_000, backupCount=3, delay=True)
+log_handler.setFormatter(logging.Formatter('%(created).3f - %(levelname)s - %(message)s'))
+# Write records to disk in batches, errors and interpreter exit flush immediately
+buffered_log_handler = BatchMemoryHandler(capacity=100, flushLevel=logging.ERROR, target=log_handler)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(buffered_log_handler)
+
+_DEPLOYMENT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "sre-cli", "deployments.json")
+_DEPLOYMENT_CACHE_TTL = 300
+_SERVICE_ACCOUNT_TOKEN = "/var/run/secrets/kubernetes.io/serviceaccount/token"
+_DAEMON_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "sre-cli", "daemon.sock")
+_DAEMON_SOCKET_ENV = "SRE_DAEMON_SOCKET"
+_POD_LIST_TIMEOUT = 10
+
+_UNHEALTHY_POD_PHASES = frozenset({"Failed", "Unknown", "Pending"})
+
+# kubernetes is imported on first use by _import_kubernetes(), it dominates startup time for --help
+client = None
+config = None
+ApiException = None
+ConfigException = None
+
+# Optional, fans out multi-pod log reads over one event loop when installed
+_HAS_KUBERNETES_ASYNCIO = importlib.util.find_spec("kubernetes_asyncio") is not None
+
+_API_CLIENT_LOCK = threading.Lock()
+
+
+def _import_kubernetes():
+    global client, config, ApiException, ConfigException
+    if ApiException is None:
+        from kubernetes import client, config
+        from kubernetes.client.rest import ApiException
+        from kubernetes.config import ConfigException
 
 
+@functools.lru_cache(maxsize=1)
+def _in_cluster():
+    # Same preconditions load_incluster_config checks, a mounted token alone is not enough (e.g. dev containers)
+    return ("KUBERNETES_SERVICE_HOST" in os.environ and "KUBERNETES_SERVICE_PORT" in os.environ
+            and os.path.exists(_SERVICE_ACCOUNT_TOKEN))
+
+
+def _load_config(configuration):
+    if _in_cluster():
+        config.load_incluster_config(client_configuration=configuration)
+    else:
+        config.load_kube_config(client_configuration=configuration)
+
+
+@functools.lru_cache(maxsize=1)
+def _build_api_client():
+    _import_kubernetes()
+    from urllib3 import Retry
+    configuration = client.Configuration()
+    configuration.connection_pool_maxsize = 32
+    configuration.retries = Retry(total=2, backoff_factor=0.2)
+    _load_config(configuration)
+    api_client = client.ApiClient(configuration)
+    # The python client can only decode JSON, so ask for a compressed body instead of protobuf
+    api_client.set_default_header('Accept-Encoding', 'gzip')
+    return api_client
+
+
+def _get_api_client():
+    # lru_cache alone does not stop two threads from loading the kubeconfig at the same time
+    with _API_CLIENT_LOCK:
+        return _build_api_client()
+
+
+@functools.lru_cache(maxsize=1)
 def get_k8s_client():
-    try:
-        config.load_incluster_config()
-    except ConfigException:
-        config.load_kube_config()
-    return client.AppsV1Api()
+    api_client = _get_api_client()
+    return client.AppsV1Api(api_client)
 
 
+@functools.lru_cache(maxsize=1)
 def get_core_client():
+    api_client = _get_api_client()
+    return client.CoreV1Api(api_client)
+
+
+def iter_pages(list_call, page=500, **kwargs):
+    token = None
+    while True:
+        resp = list_call(limit=page, _continue=token, **kwargs)
+        yield resp.items
+        token = resp.metadata._continue
+        if not token:
+            return
+
+
+def iter_deployment_pages(api, namespace=None, page=500, **kwargs):
+    if namespace:
+        return iter_pages(api.list_namespaced_deployment, page, namespace=namespace, **kwargs)
+    return iter_pages(api.list_deployment_for_all_namespaces, page, **kwargs)
+
+
+def iter_deployments(api, namespace=None, page=500, **kwargs):
+    for items in iter_deployment_pages(api, namespace, page, **kwargs):
+        yield from items
+
+
+def _load_deployment_cache():
+    try:
+        with open(_DEPLOYMENT_CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # A file of any other shape (older format, hand edits) is a cache miss, never a failed command
+    if not isinstance(cache, dict):
+        return {}
+    return {cluster: {name: entry for name, entry in entries.items() if isinstance(entry, dict)}
+            for cluster, entries in cache.items() if isinstance(entries, dict)}
+
+
+def _is_fresh(entry, now):
+    ts = entry.get("ts")
+    return isinstance(ts, (int, float)) and now - ts < _DEPLOYMENT_CACHE_TTL
+
+
+def _save_deployment_cache(cache):
+    now = time.time()
+    live = {}
+    for cluster, entries in cache.items():
+        entries = {name: entry for name, entry in entries.items() if _is_fresh(entry, now)}
+        if entries:
+            live[cluster] = entries
+    cache_dir = os.path.dirname(_DEPLOYMENT_CACHE_FILE)
     try:
-        config.load_incluster_config()
-    except ConfigException:
-        config.load_kube_config()
-    return client.CoreV1Api()
+        os.makedirs(cache_dir, exist_ok=True)
+        # Parallel runs must never read a half-written file, so swap a complete one into place
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(live, f)
+            os.replace(tmp_path, _DEPLOYMENT_CACHE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning("Could not write deployment cache: %s", e)
+
+
+def _cached_deployment_namespaces(api, name):
+    cluster = str(api.api_client.configuration.host)
+    entry = _load_deployment_cache().get(cluster, {}).get(name)
+    if not entry or not _is_fresh(entry, time.time()):
+        return None
+    namespaces = entry.get("namespaces")
+    # Only a non-empty list of names is a hit, callers index into it
+    if not isinstance(namespaces, builtins.list) or not namespaces or not all(isinstance(ns, str) for ns in namespaces):
+        return None
+    return namespaces
+
+
+def _find_deployments(api, name):
+    deployments = [d for d in iter_deployments(api, field_selector=f"metadata.name={name}")]
+    if deployments:
+        cluster = str(api.api_client.configuration.host)
+        cache = _load_deployment_cache()
+        cache.setdefault(cluster, {})[name] = {"ts": time.time(), "namespaces": [d.metadata.namespace for d in deployments]}
+        _save_deployment_cache(cache)
+    return deployments
+
+
+def resolve_deployment_namespace(api, name):
+    namespaces = _cached_deployment_namespaces(api, name)
+    if namespaces is None:
+        namespaces = [d.metadata.namespace for d in _find_deployments(api, name)]
+    return namespaces
+
+
+def invalidate_deployment_namespace(api, name):
+    cluster = str(api.api_client.configuration.host)
+    cache = _load_deployment_cache()
+    if cache.get(cluster, {}).pop(name, None) is not None:
+        _save_deployment_cache(cache)
+
+
+def _label_selector(labels):
+    return ",".join(f"{key}={value}" for key, value in (labels or {}).items())
+
+
+def _list_pods(namespace, label_selector):
+    # resource_version="0" is served from the apiserver watch cache, which ignores limit/continue
+    resp = get_core_client().list_namespaced_pod(namespace=namespace, label_selector=label_selector,
+                                                 resource_version="0", _request_timeout=_POD_LIST_TIMEOUT)
+    return resp.items
+
 
 @click.group()
 def cli():
@@ -43,18 +272,18 @@ def cli():
 @click.command()
 @click.option('--namespace', help='List deployments in the specified namespace, if not specified will list deployments in all namespaces')
 def list(namespace):
-    api = get_k8s_client()
-    logging.info(f"-- list started --")
+    logger.info("-- list started --")
     try:
-        if namespace:
-            deployments = api.list_namespaced_deployment(namespace=namespace).items
-        else:
-            deployments = api.list_deployment_for_all_namespaces().items
-        for dep in deployments:
-            click.echo(f"Deployment: {dep.metadata.name} Namespace: {dep.metadata.namespace}")
-            logging.info(f"Deployment: {dep.metadata.name} Namespace: {dep.metadata.namespace}")
+        api = get_k8s_client()
+        count = 0
+        for items in iter_deployment_pages(api, namespace):
+            lines = [f"Deployment: {dep.metadata.name} Namespace: {dep.metadata.namespace}" for dep in items]
+            if lines:
+                click.echo("\n".join(lines))
+            count += len(lines)
+        logger.info("Listed %d deployments", count)
     except Exception as e:
-        logging.error(f"Error listing deployments: {e}")
+        logger.error("Error listing deployments: %s", e)
         click.echo(f"Error listing deployments: {e}", err=True)
 
 
@@ -63,113 +292,170 @@ def list(namespace):
 @click.option('--replicas', required=True, type=int, help='Number of replicas to scale to.')
 @click.option('--namespace', help='Namespace of the deployment, if not specified will search in all namespaces')
 def scale(deployment, replicas, namespace):
-    logging.info(f"-- scale started --")
+    _import_kubernetes()
+    logger.info("-- scale started --")
     try:
         if replicas <= 0:
             click.echo("Replicas must be a positive integer.", err=True)
             return
         api = get_k8s_client()
-        if namespace:
-            api.read_namespaced_deployment(name=deployment, namespace=namespace)
-            deployment_namespace = namespace
-        else:
-            deployments = []
-            for d in api.list_deployment_for_all_namespaces().items:
-                if d.metadata.name == deployment:
-                    deployments.append(d)
-            if not deployments:
-                click.echo(f"Deployment {deployment} not found in any namespace.", err=True)
-                logging.error(f"Deployment {deployment} not found in any namespace.")
+        deployment_namespace = namespace
+        from_cache = False
+        if not namespace:
+            namespaces = _cached_deployment_namespaces(api, deployment)
+            from_cache = namespaces is not None
+            if not from_cache:
+                namespaces = [d.metadata.namespace for d in _find_deployments(api, deployment)]
+            deployment_namespace = _choose_namespace_to_scale(deployment, namespaces)
+            if deployment_namespace is None:
                 return
-            if len(deployments) > 1:
-                click.echo("Multiple deployments have the same name:")
-                for i, dep in enumerate(deployments, 1):
-                    click.echo(f"{i}. Namespace: {dep.metadata.namespace}")
-                choice = click.prompt("Enter the number of the namespace to scale", type=int)
-                if choice < 1 or choice > len(deployments):
-                    click.echo("Invalid selection.", err=True)
-                    return
-                deployment_namespace = deployments[choice-1].metadata.namespace
-            else:
-                deployment_namespace = deployments[0].metadata.namespace
         patch_payload = {
             "spec": {
                 "replicas": replicas
             }
         }
-        api.patch_namespaced_deployment(name=deployment, namespace=deployment_namespace, body=patch_payload)
+        while True:
+            try:
+                api.patch_namespaced_deployment(name=deployment, namespace=deployment_namespace, body=patch_payload)
+                break
+            except ApiException as e:
+                if e.status != 404 or not from_cache:
+                    raise
+                # The cached namespace is stale (deployment moved or was recreated), look it up once more
+                from_cache = False
+                invalidate_deployment_namespace(api, deployment)
+                namespaces = [d.metadata.namespace for d in _find_deployments(api, deployment)]
+                deployment_namespace = _choose_namespace_to_scale(deployment, namespaces)
+                if deployment_namespace is None:
+                    return
         click.echo(f"Scaled deployment {deployment} to {replicas} replicas in namespace {deployment_namespace}")
-        logging.info(f"Scaled {deployment} to {replicas} replicas in {deployment_namespace}")
+        logger.info("Scaled %s to %s replicas in %s", deployment, replicas, deployment_namespace)
+
+    except ApiException as e:
+        if e.status == 404:
+            invalidate_deployment_namespace(get_k8s_client(), deployment)
+            logger.error("Deployment %s not found in namespace %s", deployment, deployment_namespace)
+            click.echo(f"Deployment {deployment} not found in namespace {deployment_namespace}", err=True)
+        else:
+            logger.error("API error occurred: %s", e)
+            click.echo(f"API error occurred: {e}", err=True)
 
     except ConfigException as e:
-        logging.error(f"k8s config error: {e}")
+        logger.error("k8s config error: %s", e)
         click.echo(f"k8s config error: {e}. Please check your kubeconfig.", err=True)
 
     except Exception as e:
-        logging.error(f"An unexpected error occurred: {e}")
+        logger.error("An unexpected error occurred: %s", e)
         click.echo(f"An unexpected error occurred: {e}", err=True)
 
+def _choose_namespace_to_scale(deployment, namespaces):
+    if not namespaces:
+        click.echo(f"Deployment {deployment} not found in any namespace.", err=True)
+        logger.error("Deployment %s not found in any namespace.", deployment)
+        return None
+    if len(namespaces) == 1:
+        return namespaces[0]
+    click.echo("Multiple deployments have the same name:")
+    for i, ns in enumerate(namespaces, 1):
+        click.echo(f"{i}. Namespace: {ns}")
+    choice = click.prompt("Enter the number of the namespace to scale", type=int)
+    if choice < 1 or choice > len(namespaces):
+        click.echo("Invalid selection.", err=True)
+        return None
+    return namespaces[choice-1]
+
+
+def _first_deployment(api, deployment):
+    deployments = _find_deployments(api, deployment)
+    if not deployments:
+        click.echo(f"Deployment {deployment} not found in any namespace.", err=True)
+        logger.error("Deployment %s not found in any namespace.", deployment)
+        return None
+    return deployments[0]
+
+
 @click.command()
 @click.option('--deployment', required=True, help='Name of the deployment to show.')
 @click.option('--namespace', help='Namespace of the deployment, if not specified will show info of first deployment found')
 def info(deployment, namespace):
-    api = get_k8s_client()
+    _import_kubernetes()
     try:
+        api = get_k8s_client()
+        dep = None
+        from_cache = False
         if not namespace:
-            deployments = []
-            for d in api.list_deployment_for_all_namespaces().items:
-                if d.metadata.name == deployment:
-                    deployments.append(d)
-            if not deployments:
-                click.echo(f"Deployment {deployment} not found in any namespace.", err=True)
-                logging.error(f"Deployment {deployment} not found in any namespace.")
-                return
-            dep = deployments[0]
-            namespace = dep.metadata.namespace
-        else:
-            dep = api.read_namespaced_deployment(name=deployment, namespace=namespace)
+            namespaces = _cached_deployment_namespaces(api, deployment)
+            from_cache = namespaces is not None
+            if from_cache:
+                namespace = namespaces[0]
+            else:
+                # A cache miss has to LIST anyway, reuse the returned object instead of reading it again
+                dep = _first_deployment(api, deployment)
+                if dep is None:
+                    return
+                namespace = dep.metadata.namespace
+        core_api = get_core_client()
+        while True:
+            try:
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    svc_future = executor.submit(core_api.read_namespaced_service, name=deployment, namespace=namespace)
+                    ep_future = executor.submit(core_api.read_namespaced_endpoints, name=deployment, namespace=namespace)
+                    if dep is None:
+                        dep = executor.submit(api.read_namespaced_deployment, name=deployment, namespace=namespace).result()
+                break
+            except ApiException as e:
+                if e.status != 404 or not from_cache:
+                    raise
+                # The cached namespace is stale (deployment moved or was recreated), look it up once more
+                from_cache = False
+                invalidate_deployment_namespace(api, deployment)
+                dep = _first_deployment(api, deployment)
+                if dep is None:
+                    return
+                namespace = dep.metadata.namespace
         click.echo(f"Deployment: {dep.metadata.name}")
         click.echo(f"Namespace: {dep.metadata.namespace}")
         click.echo(f"Replicas: {dep.spec.replicas}")
         click.echo(f"Deployment Strategy: {dep.spec.strategy.type}")
-        logging.info(f"-- info started --")
-        logging.info(f"Deployment {deployment} - Desired: {dep.spec.replicas}, Current: {dep.status.replicas}, Available: {dep.status.available_replicas}")
-        core_api = get_core_client()
+        logger.info("-- info started --")
+        logger.info("Deployment %s - Desired: %s, Current: %s, Available: %s", deployment, dep.spec.replicas, dep.status.replicas, dep.status.available_replicas)
         try:
-            svc = core_api.read_namespaced_service(name=deployment, namespace=namespace)
+            svc = svc_future.result()
             click.echo("Associated Service:")
             click.echo(f"- Service: {svc.metadata.name}")
-            logging.info(f"Service: {svc.metadata.name} in namespace {namespace}")
+            logger.info("Service: %s in namespace %s", svc.metadata.name, namespace)
             click.echo(f"-  Type: {svc.spec.type}")
-            click.echo(f"-  Ports: {', '.join([str(port.port) for port in svc.spec.ports])}")
-            logging.info(f"Service {svc.metadata.name} has ports: {', '.join([str(port.port) for port in svc.spec.ports])}")
+            ports = ', '.join(str(port.port) for port in svc.spec.ports)
+            click.echo(f"-  Ports: {ports}")
+            logger.info("Service %s has ports: %s", svc.metadata.name, ports)
         except ApiException as e:
             click.echo(f"No service named {dep.metadata.name} found in namespace {namespace}", err=True)
-            logging.warning(f"Service {dep.metadata.name} not found in namespace {namespace}")
+            logger.warning("Service %s not found in namespace %s", dep.metadata.name, namespace)
         try:
-            ep = core_api.read_namespaced_endpoints(name=deployment, namespace=namespace)
+            ep = ep_future.result()
             click.echo("Associated Endpoints:")
             click.echo(f"- Endpoint: {ep.metadata.name}")
-            logging.info(f"Endpoint: {ep.metadata.name}")
+            logger.info("Endpoint: %s", ep.metadata.name)
             for subset in ep.subsets:
                 for address in subset.addresses or []:
                     click.echo(f"- Address: {address.ip}")
-                    logging.info(f"Endpoint {ep.metadata.name} has address: {address.ip}")
+                    logger.info("Endpoint %s has address: %s", ep.metadata.name, address.ip)
         except ApiException as e:
-            logging.warning(f"Endpoints for service {dep.metadata.name} not found in namespace {namespace}")
+            logger.warning("Endpoints for service %s not found in namespace %s", dep.metadata.name, namespace)
             click.echo(f"No endpoints found for service {dep.metadata.name} in namespace {namespace}", err=True)
     except ApiException as e:
         if e.status == 404:
-            logging.error(f"Deployment {deployment} not found in namespace {namespace}")
+            invalidate_deployment_namespace(api, deployment)
+            logger.error("Deployment %s not found in namespace %s", deployment, namespace)
             click.echo(f"Deployment {deployment} not found in namespace {namespace}", err=True)
         else:
-            logging.error(f"API error occurred: {e}")
+            logger.error("API error occurred: %s", e)
             click.echo(f"API error occurred: {e}", err=True)
     except ConfigException as e:
-        logging.error(f"k8s config error: {e}")
+        logger.error("k8s config error: %s", e)
         click.echo(f"k8s config error: {e}. Please check your kubeconfig.", err=True)
     except Exception as e:
-        logging.error(f"An unexpected error occurred: {e}")
+        logger.error("An unexpected error occurred: %s", e)
         click.echo(f"An unexpected error occurred: {e}", err=True)
 
 
@@ -178,81 +464,85 @@ def info(deployment, namespace):
 @click.option('--namespace', required=True, help='Namespace of the deployment to search in.')
 @click.option('--pod', is_flag=True,help='This is a flag, pass for pod level diagnostics')
 def diagnostic(deployment, namespace, pod):
-    api = get_k8s_client()
-
+    _import_kubernetes()
     try:
+        api = get_k8s_client()
         dep = api.read_namespaced_deployment(name=deployment, namespace=namespace)
+        desired, current, available = dep.spec.replicas, dep.status.replicas, dep.status.available_replicas
         click.echo(f"Deployment: {dep.metadata.name}")
         click.echo(f"Namespace: {dep.metadata.namespace}")
-        click.echo(f"Desired Replicas: {dep.spec.replicas}")
-        click.echo(f"Current Replicas: {dep.status.replicas}")
-        click.echo(f"Available Replicas: {dep.status.available_replicas}")
-        logging.info(f"-- diagnostics started --")
-        logging.info(f"Deployment {deployment} - Desired: {dep.spec.replicas}, Current: {dep.status.replicas}, Available: {dep.status.available_replicas}")
-        if dep.spec.replicas != dep.status.replicas:
+        click.echo(f"Desired Replicas: {desired}")
+        click.echo(f"Current Replicas: {current}")
+        click.echo(f"Available Replicas: {available}")
+        logger.info("-- diagnostics started --")
+        logger.info("Deployment %s - Desired: %s, Current: %s, Available: %s", deployment, desired, current, available)
+        if desired != current:
             click.echo(
-                f"Warning: Desired replicas ({dep.spec.replicas}) don't match current replicas ({dep.status.replicas})!")
-            logging.warning(
-                f"Desired replicas ({dep.spec.replicas}) don't match current replicas ({dep.status.replicas})!")
-        if dep.status.replicas != dep.status.available_replicas:
+                f"Warning: Desired replicas ({desired}) don't match current replicas ({current})!")
+            logger.warning(
+                "Desired replicas (%s) don't match current replicas (%s)!", desired, current)
+        if current != available:
             click.echo(
-                f"Warning: Not all replicas are available. Available: {dep.status.available_replicas}, Total: {dep.status.replicas}")
-            logging.warning(
-                f"Not all replicas are available. Available: {dep.status.available_replicas}, Total: {dep.status.replicas}")
+                f"Warning: Not all replicas are available. Available: {available}, Total: {current}")
+            logger.warning(
+                "Not all replicas are available. Available: %s, Total: %s", available, current)
         if pod:
-            core_api = get_core_client()
-            labels = dep.spec.template.metadata.labels
-            if not labels:
+            label_selector = _label_selector(dep.spec.template.metadata.labels)
+            if not label_selector:
                 click.echo(f"Deployment {deployment} has no labels.")
                 return
-            label_selector = ""
-            for key, value in labels.items():
-                if label_selector:
-                    label_selector += ","
-                label_selector += f"{key}={value}"
-            pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=label_selector).items
+            pods = _list_pods(namespace, label_selector)
             if not pods:
                 click.echo(f"No pods found for deployment {deployment} in namespace {namespace}.")
-                logging.warning(f"No pods found for deployment {deployment} in namespace {namespace}")
+                logger.warning("No pods found for deployment %s in namespace %s", deployment, namespace)
                 return
             for p in pods:
-                click.echo(f"\nPod: {p.metadata.name} - Status: {p.status.phase}")
-                logging.info(f"Pod: {p.metadata.name} - Status: {p.status.phase}")
-                for container_status in p.status.container_statuses:
-                    if container_status.state.waiting:
-                        waiting_reason = container_status.state.waiting.reason
-                        click.echo(f"Container: {container_status.name} - Waiting due to: {waiting_reason}")
-                        logging.info(f"Container: {container_status.name} - Waiting due to: {waiting_reason}")
-                    elif container_status.state.terminated:
-                        terminated_reason = container_status.state.terminated.reason
-                        click.echo(f"Container: {container_status.name} - Terminated due to: {terminated_reason}")
-                        logging.info(f"Container: {container_status.name} - Terminated due to: {terminated_reason}")
-                        if container_status.last_state and container_status.last_state.terminated:
-                            last_terminated_reason = container_status.last_state.terminated.reason
-                            click.echo(f"Last Terminated: {last_terminated_reason}")
-                            logging.info(f"Last Terminated: {last_terminated_reason}")
-                if p.status.phase in ["Failed", "Unknown", "Pending"]:
-                    click.echo(f"Pod {p.metadata.name} is in {p.status.phase} state. Further investigation is required.")
-                    logging.warning(f"Pod {p.metadata.name} is in {p.status.phase} state.")
-                for container in p.spec.containers:
-                    if container.resources.requests:
-                        click.echo(f"CPU Request: {container.resources.requests.get('cpu', 'N/A')}")
-                        click.echo(f"Memory Request: {container.resources.requests.get('memory', 'N/A')}")
-                    if container.resources.limits:
-                        click.echo(f"CPU Limit: {container.resources.limits.get('cpu', 'N/A')}")
-                        click.echo(f"Memory Limit: {container.resources.limits.get('memory', 'N/A')}")
+                pod_name, phase = p.metadata.name, p.status.phase
+                statuses_by_name = {cs.name: cs for cs in p.status.container_statuses or ()}
+                status_lines = [f"Pod: {pod_name} - Status: {phase}"]
+                lines = ["", status_lines[0]]
+                # Walk spec.containers once, pairing each container with its status by name
+                for container in p.spec.containers or ():
+                    cname = container.name
+                    container_status = statuses_by_name.get(cname)
+                    container_lines = []
+                    if container_status:
+                        waiting, terminated = container_status.state.waiting, container_status.state.terminated
+                        if waiting:
+                            container_lines.append(f"Container: {cname} - Waiting due to: {waiting.reason}")
+                        elif terminated:
+                            container_lines.append(f"Container: {cname} - Terminated due to: {terminated.reason}")
+                            last_state = container_status.last_state
+                            if last_state and last_state.terminated:
+                                container_lines.append(f"Last Terminated: {last_state.terminated.reason}")
+                    status_lines.extend(container_lines)
+                    lines.extend(container_lines)
+                    requests, limits = container.resources.requests, container.resources.limits
+                    if requests:
+                        lines.append(f"CPU Request: {requests.get('cpu', 'N/A')}")
+                        lines.append(f"Memory Request: {requests.get('memory', 'N/A')}")
+                    if limits:
+                        lines.append(f"CPU Limit: {limits.get('cpu', 'N/A')}")
+                        lines.append(f"Memory Limit: {limits.get('memory', 'N/A')}")
+                # One write and one log record per pod instead of one per line
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("%s", "; ".join(status_lines))
+                if phase in _UNHEALTHY_POD_PHASES:
+                    lines.append(f"Pod {pod_name} is in {phase} state. Further investigation is required.")
+                    logger.warning("Pod %s is in %s state.", pod_name, phase)
+                click.echo("\n".join(lines))
     except ApiException as e:
         if e.status == 404:
-            logging.error(f"Deployment {deployment} not found in namespace {namespace}")
+            logger.error("Deployment %s not found in namespace %s", deployment, namespace)
             click.echo(f"Deployment {deployment} not found in namespace {namespace}", err=True)
         else:
-            logging.error(f"API error occurred: {e}")
+            logger.error("API error occurred: %s", e)
             click.echo(f"API error occurred: {e}", err=True)
     except ConfigException as e:
-        logging.error(f"k8s config error: {e}")
+        logger.error("k8s config error: %s", e)
         click.echo(f"k8s config error: {e}. Please check your kubeconfig.", err=True)
     except Exception as e:
-        logging.error(f"An unexpected error occurred: {e}")
+        logger.error("An unexpected error occurred: %s", e)
         click.echo(f"An unexpected error occurred: {e}", err=True)
 
 
@@ -260,28 +550,28 @@ def diagnostic(deployment, namespace, pod):
 @click.option('--deployment', required=True, help='Name of the deployment to restart.')
 @click.option('--namespace', required=True, help='Namespace of the deployment.')
 def rollout(deployment, namespace):
+    _import_kubernetes()
     try:
         api = get_k8s_client()
-        logging.info(f"-- rollout started --")
+        logger.info("-- rollout started --")
         api.read_namespaced_deployment(name=deployment, namespace=namespace)
-        import time
-        timestamp = str(time.time())
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         patch_body = {"spec": {"template": {"metadata": {"annotations": {"kubectl.k8s.io/restartedAt": timestamp}}}}}
         api.patch_namespaced_deployment(name=deployment, namespace=namespace, body=patch_body)
         click.echo(f"Rolled out deployment {deployment} in namespace {namespace}")
-        logging.info(f"Rolled out deployment {deployment} in namespace {namespace}")
+        logger.info("Rolled out deployment %s in namespace %s", deployment, namespace)
     except ApiException as e:
         if e.status == 404:
-            logging.error(f"Deployment {deployment} not found in namespace {namespace}")
+            logger.error("Deployment %s not found in namespace %s", deployment, namespace)
             click.echo(f"Deployment {deployment} not found in namespace {namespace}", err=True)
         else:
-            logging.error(f"API error occurred: {e}")
+            logger.error("API error occurred: %s", e)
             click.echo(f"API error occurred: {e}", err=True)
     except ConfigException as e:
-        logging.error(f"k8s config error: {e}")
+        logger.error("k8s config error: %s", e)
         click.echo(f"k8s config error: {e}. Please check your kubeconfig.", err=True)
     except Exception as e:
-        logging.error(f"An unexpected error occurred: {e}")
+        logger.error("An unexpected error occurred: %s", e)
         click.echo(f"An unexpected error occurred: {e}", err=True)
 
 
@@ -290,70 +580,414 @@ def rollout(deployment, namespace):
 @click.option('--pod', help='Name of the pod to fetch logs from.')
 @click.option('--namespace', required=True, help='Namespace of the deployment.')
 @click.option('--tail', default=50, type=int, help='Number of log lines to retrieve. Default is 50.')
-def logs(deployment, pod, namespace, tail):
+@click.option('--concurrency', default=6, type=click.IntRange(min=1), help='Number of pods to fetch logs from in parallel. Default is 6.')
+def logs(deployment, pod, namespace, tail, concurrency):
     if not deployment and not pod:
         click.echo("You must specify either --deployment or --pod.", err=True)
         return
-    logging.info("-- logs started --")
-    api = get_k8s_client()
-    core_api = get_core_client()
+    logger.info("-- logs started --")
+    _import_kubernetes()
     try:
+        core_api = get_core_client()
         if deployment:
+            api = get_k8s_client()
             dep = api.read_namespaced_deployment(name=deployment, namespace=namespace)
-            labels = dep.spec.template.metadata.labels
-            if not labels:
+            label_selector = _label_selector(dep.spec.template.metadata.labels)
+            if not label_selector:
                 click.echo(f"Deployment {deployment} has no labels.")
                 return
-            label_selector = ""
-            for key, value in labels.items():
-                if label_selector:
-                    label_selector += ","
-                label_selector += f"{key}={value}"
-            pods = core_api.list_namespaced_pod(namespace=namespace, label_selector=label_selector).items
+            pods = _list_pods(namespace, label_selector)
             if not pods:
                 click.echo(f"No pods found for deployment {deployment} in namespace {namespace}.", err=True)
-                logging.error(f"No pods found for deployment {deployment} in namespace {namespace}.")
+                logger.error("No pods found for deployment %s in namespace %s.", deployment, namespace)
                 return
-            for pod_obj in pods:
-                fetch_pod_logs(core_api, pod_obj.metadata.name, namespace, tail)
+            pod_names = [p.metadata.name for p in pods]
+            if len(pod_names) == 1:
+                fetch_pod_logs(core_api, pod_names[0], namespace, tail)
+            elif _HAS_KUBERNETES_ASYNCIO:
+                fetch_pods_logs_async(pod_names, namespace, tail, concurrency)
+            else:
+                # Issue the requests concurrently, stream the bodies in pod order for deterministic output.
+                # A new request is only sent once a body has been released, so at most `concurrency` are open.
+                with ThreadPoolExecutor(max_workers=min(concurrency, len(pod_names))) as executor:
+                    window = deque()
+                    for name in pod_names:
+                        if len(window) == concurrency:
+                            _print_pod_logs(*window.popleft())
+                        window.append((name, namespace, executor.submit(_request_pod_logs, core_api, name, namespace, tail).result))
+                    while window:
+                        _print_pod_logs(*window.popleft())
         elif pod:
             fetch_pod_logs(core_api, pod, namespace, tail)
     except ApiException as e:
         if e.status == 404:
-            logging.error(f"Resource not found: {e}")
+            logger.error("Resource not found: %s", e)
             click.echo(f"Resource not found: {e}", err=True)
         else:
-            logging.error(f"API error occurred: {e}")
+            logger.error("API error occurred: %s", e)
             click.echo(f"API error occurred: {e}", err=True)
     except ConfigException as e:
-        logging.error(f"k8s config error: {e}")
+        logger.error("k8s config error: %s", e)
         click.echo(f"k8s config error: {e}. Please check your kubeconfig.", err=True)
     except Exception as e:
-        logging.error(f"An unexpected error occurred: {e}")
+        logger.error("An unexpected error occurred: %s", e)
         click.echo(f"An unexpected error occurred: {e}", err=True)
 
 
 def fetch_pod_logs(core_api, pod_name, namespace, tail):
-    try:
-        logs = core_api.read_namespaced_pod_log(name=pod_name, namespace=namespace, tail_lines=tail)
+    _print_pod_logs(pod_name, namespace, lambda: _request_pod_logs(core_api, pod_name, namespace, tail))
 
-        click.echo(f"Logs for pod {pod_name} (namespace: {namespace}):")
-        click.echo(logs if logs else "No logs available.")
-        logging.info(f"Fetched logs for pod {pod_name} in namespace {namespace}")
+
+def _request_pod_logs(core_api, pod_name, namespace, tail):
+    return core_api.read_namespaced_pod_log(name=pod_name, namespace=namespace, tail_lines=tail, _preload_content=False)
+
+
+def _print_pod_logs(pod_name, namespace, request):
+    try:
+        resp = request()
+        try:
+            click.echo(f"Logs for pod {pod_name} (namespace: {namespace}):")
+            last_chunk = b""
+            for chunk in resp.stream(65536):
+                click.echo(chunk, nl=False)
+                last_chunk = chunk
+            _finish_pod_logs(last_chunk)
+        finally:
+            resp.release_conn()
+        logger.info("Fetched logs for pod %s in namespace %s", pod_name, namespace)
     except ApiException as e:
-        logging.warning(f"Could not retrieve logs for pod {pod_name}: {e}")
+        logger.warning("Could not retrieve logs for pod %s: %s", pod_name, e)
         click.echo(f"Could not retrieve logs for pod {pod_name}: {e}", err=True)
 
 
+def _finish_pod_logs(last_chunk):
+    if not last_chunk:
+        click.echo("No logs available.")
+    elif not last_chunk.endswith(b"\n"):
+        click.echo()
+
+
+def _async_configuration(async_client):
+    # Reuse the credentials the shared client already resolved instead of loading the kubeconfig again
+    source = _get_api_client().configuration
+    configuration = async_client.Configuration()
+    for attr in ("host", "username", "password", "ssl_ca_cert", "cert_file", "key_file", "verify_ssl",
+                 "assert_hostname", "tls_server_name", "proxy", "proxy_headers", "connection_pool_maxsize"):
+        setattr(configuration, attr, getattr(source, attr))
+    configuration.api_key = dict(source.api_key)
+    configuration.api_key_prefix = dict(source.api_key_prefix)
+    return configuration
+
+
+def fetch_pods_logs_async(pod_names, namespace, tail, concurrency):
+    import asyncio
+    from kubernetes_asyncio import client as async_client
+    from kubernetes_asyncio.client.exceptions import ApiException as AsyncApiException
+
+    async def open_log(core_api, pod_name):
+        resp = await core_api.read_namespaced_pod_log(name=pod_name, namespace=namespace, tail_lines=tail,
+                                                      _preload_content=False)
+        # Without preloading the client returns the raw response and leaves the status check to the caller
+        if not 200 <= resp.status <= 299:
+            try:
+                e = AsyncApiException(status=resp.status, reason=resp.reason)
+                e.body = await resp.text()
+            finally:
+                resp.release()
+            raise e
+        return resp
+
+    async def print_log(pod_name, request):
+        try:
+            resp = await request
+        except AsyncApiException as e:
+            logger.warning("Could not retrieve logs for pod %s: %s", pod_name, e)
+            click.echo(f"Could not retrieve logs for pod {pod_name}: {e}", err=True)
+            return
+        try:
+            click.echo(f"Logs for pod {pod_name} (namespace: {namespace}):")
+            last_chunk = b""
+            async for chunk in resp.content.iter_chunked(65536):
+                click.echo(chunk, nl=False)
+                last_chunk = chunk
+            _finish_pod_logs(last_chunk)
+        finally:
+            resp.release()
+        logger.info("Fetched logs for pod %s in namespace %s", pod_name, namespace)
+
+    async def read_logs():
+        async with async_client.ApiClient(_async_configuration(async_client)) as api_client:
+            core_api = async_client.CoreV1Api(api_client)
+            # Same window as the thread pool path: at most `concurrency` responses open, printed in pod order
+            window = deque()
+            for name in pod_names:
+                if len(window) == concurrency:
+                    await print_log(*window.popleft())
+                window.append((name, asyncio.ensure_future(open_log(core_api, name))))
+            while window:
+                await print_log(*window.popleft())
+
+    asyncio.run(read_logs())
+
+
+def _kubeconfig_identity():
+    # Anything that changes which cluster a command would reach, e.g. `kubectl config use-context` rewrites the file
+    paths = os.environ.get("KUBECONFIG") or os.path.join("~", ".kube", "config")
+    files = []
+    for path in paths.split(os.pathsep):
+        path = os.path.abspath(os.path.expanduser(path))
+        try:
+            files.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            files.append([path, None])
+    return {"in_cluster": _in_cluster(), "kubeconfig": files}
+
+
+_FRAME_HEADER = struct.Struct(">cI")
+
+
+def _write_frame(wfile, kind, payload=b""):
+    wfile.write(_FRAME_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _read_frame(rfile):
+    header = rfile.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        raise EOFError("connection closed by the daemon")
+    kind, size = _FRAME_HEADER.unpack(header)
+    return kind, rfile.read(size)
+
+
+class _FrameWriter(io.RawIOBase):
+    def __init__(self, wfile, kind):
+        self.wfile = wfile
+        self.kind = kind
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        _write_frame(self.wfile, self.kind, bytes(data))
+        return len(data)
+
+
+class _DaemonStdin(io.TextIOBase):
+    """Forwards prompts (e.g. scale picking a namespace) to the calling terminal."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def readable(self):
+        return True
+
+    def readline(self, size=-1):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        _write_frame(self.handler.wfile, b"i")
+        return json.loads(self.handler.rfile.readline() or b'""')
+
+
+class _ThreadLocalStream:
+    """Stands in for sys.stdin/stdout/stderr in the daemon, each request thread sees its own client's stream."""
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def __getattr__(self, name):
+        stream = getattr(self.local, "stream", None)
+        return getattr(self.default if stream is None else stream, name)
+
+
+_STD_STREAMS_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def _thread_std_streams(**streams):
+    with _STD_STREAMS_LOCK:
+        for name in streams:
+            if not isinstance(getattr(sys, name), _ThreadLocalStream):
+                setattr(sys, name, _ThreadLocalStream(getattr(sys, name)))
+        proxies = {name: getattr(sys, name) for name in streams}
+    for name, stream in streams.items():
+        proxies[name].local.stream = stream
+    try:
+        yield
+    finally:
+        for proxy in proxies.values():
+            proxy.local.stream = None
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    # A request waiting on a prompt must not hold up other callers or the daemon's shutdown
+    daemon_threads = True
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            self.run_command()
+        finally:
+            # The daemon is long-lived, write each command's log records now instead of waiting for 100 of them
+            buffered_log_handler.flush()
+
+    def run_command(self):
+        line = self.rfile.readline()
+        if not line:
+            # _daemon_running() probes the socket by connecting and closing without a request
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict) or not isinstance(request.get("args"), builtins.list):
+            logger.warning("Ignoring malformed daemon request: %r", line[:200])
+            return
+        if request.get("kubeconfig") != self.server.kubeconfig:
+            logger.warning("Caller kubeconfig differs from the daemon's, not running %s", request["args"][:1])
+            _write_frame(self.wfile, b"f")
+            return
+        # Output is framed onto the socket as it is written, bytes from log streaming pass through untouched
+        stdout = io.TextIOWrapper(io.BufferedWriter(_FrameWriter(self.wfile, b"o")), encoding="utf-8")
+        stderr = io.TextIOWrapper(io.BufferedWriter(_FrameWriter(self.wfile, b"e")), encoding="utf-8")
+        try:
+            with _thread_std_streams(stdin=_DaemonStdin(self), stdout=stdout, stderr=stderr):
+                try:
+                    exit_code = cli.main(args=request["args"], prog_name="sre.py", standalone_mode=False) or 0
+                except click.exceptions.Abort:
+                    click.echo("Aborted!", err=True)
+                    exit_code = 1
+                except click.exceptions.ClickException as e:
+                    e.show()
+                    exit_code = e.exit_code
+                finally:
+                    stdout.flush()
+                    stderr.flush()
+            _write_frame(self.wfile, b"x", str(exit_code).encode("ascii"))
+        except OSError as e:
+            logger.warning("Lost connection to daemon client: %s", e)
+
+
+def _daemon_socket():
+    # One setting for both sides, so a daemon on another path is still reachable
+    return os.environ.get(_DAEMON_SOCKET_ENV) or _DAEMON_SOCKET
+
+
+def _run_via_daemon(args, socket_path=None):
+    socket_path = socket_path or _daemon_socket()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    stdin = sys.stdin
+    outputs = {b"o": sys.stdout.buffer, b"e": sys.stderr.buffer}
+    with sock, sock.makefile("rwb") as f:
+        try:
+            f.write(json.dumps({"args": args, "kubeconfig": _kubeconfig_identity()}).encode("utf-8") + b"\n")
+            f.flush()
+            while True:
+                kind, payload = _read_frame(f)
+                if kind in outputs:
+                    outputs[kind].write(payload)
+                    outputs[kind].flush()
+                elif kind == b"i":
+                    f.write(json.dumps(stdin.readline()).encode("utf-8") + b"\n")
+                    f.flush()
+                elif kind == b"x":
+                    return int(payload)
+                elif kind == b"f":
+                    # Refused before anything ran (different kubeconfig), safe to run locally
+                    return None
+                else:
+                    # The command may already have run, so do not retry it locally
+                    click.echo(f"Unexpected reply from the sre.py daemon: {kind!r}", err=True)
+                    return 1
+        except (OSError, EOFError) as e:
+            # The command may already have run, so do not retry it locally
+            click.echo(f"Lost connection to the sre.py daemon: {e}", err=True)
+            return 1
+        except KeyboardInterrupt:
+            # Closing the socket ends the daemon's side, a pending prompt there aborts
+            click.echo("Aborted!", err=True)
+            return 1
+
+
+def _daemon_running(socket_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+@click.command()
+def daemon():
+    """Keep a warm Kubernetes client and serve other sre.py invocations over a UNIX socket (path from $SRE_DAEMON_SOCKET)."""
+    if not hasattr(socket, "AF_UNIX"):
+        click.echo("Daemon mode requires UNIX domain sockets.", err=True)
+        return
+    _import_kubernetes()
+    try:
+        _get_api_client()
+    except ConfigException as e:
+        logger.error("k8s config error: %s", e)
+        click.echo(f"k8s config error: {e}. Please check your kubeconfig.", err=True)
+        return
+    # Loading may refresh an auth-provider token and rewrite the kubeconfig, so take the identity afterwards
+    kubeconfig = _kubeconfig_identity()
+    socket_path = _daemon_socket()
+    if os.path.dirname(socket_path):
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    if os.path.exists(socket_path):
+        if _daemon_running(socket_path):
+            click.echo(f"An sre.py daemon is already serving {socket_path}.", err=True)
+            return
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(socket_path)
+    # The socket hands out the user's cluster credentials, keep it private
+    old_umask = os.umask(0o077)
+    try:
+        server = _DaemonServer(socket_path, _DaemonHandler)
+    finally:
+        os.umask(old_umask)
+    # Callers with a different KUBECONFIG, context or in-cluster setting run locally instead
+    server.kubeconfig = kubeconfig
+    logger.info("-- daemon started on %s --", socket_path)
+    click.echo(f"Serving sre.py commands on {socket_path}, press Ctrl+C to stop.")
+    # Stop cleanly on SIGTERM too, so the socket is removed and buffered log records are written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+        logger.info("-- daemon stopped --")
+
+
 cli.add_command(list)
 cli.add_command(scale)
 cli.add_command(info)
 cli.add_command(diagnostic)
 cli.add_command(rollout)
 cli.add_command(logs)
+cli.add_command(daemon)
 
 
 if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args and args[0] in cli.commands and args[0] != 'daemon':
+        exit_code = _run_via_daemon(args)
+        if exit_code is not None:
+            sys.exit(exit_code)
     cli()
 
 
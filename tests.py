@@ -1,28 +1,54 @@
+import importlib.util
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 import sre
 from click.testing import CliRunner
 from kubernetes.client.rest import ApiException
 
 
+def make_deployment(name, namespace, replicas=3, available_replicas=3, strategy="RollingUpdate", labels=None):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name, namespace=namespace),
+        spec=SimpleNamespace(replicas=replicas, strategy=SimpleNamespace(type=strategy),
+                             template=SimpleNamespace(metadata=SimpleNamespace(labels=labels or {"app": name}))),
+        status=SimpleNamespace(replicas=replicas, available_replicas=available_replicas))
+
+
+def make_pod(name, phase, containers=(), container_statuses=None):
+    return SimpleNamespace(metadata=SimpleNamespace(name=name),
+                           spec=SimpleNamespace(containers=list(containers)),
+                           status=SimpleNamespace(phase=phase, container_statuses=container_statuses))
+
+
 class TestSRE(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.tmp_dir = cache_dir.name
+        cache_patcher = patch('sre._DEPLOYMENT_CACHE_FILE', os.path.join(cache_dir.name, 'deployments.json'))
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
     @patch('sre.get_k8s_client')
     def test_list_deployments(self, mock_get_k8s_client):
         mock_api = MagicMock()
         mock_get_k8s_client.return_value = mock_api
 
-        mock_deployments = [
-            MagicMock(metadata=MagicMock(name='dep1', namespace='namespace1')),
-            MagicMock(metadata=MagicMock(name='dep2', namespace='namespace2'))
-        ]
-
-
+        mock_deployments = [make_deployment('dep1', 'namespace1'), make_deployment('dep2', 'namespace2')]
         mock_api.list_deployment_for_all_namespaces.return_value.items = mock_deployments
-
-        mock_deployments[0].metadata.name = 'dep1'
-        mock_deployments[0].metadata.namespace = 'namespace1'
-        mock_deployments[1].metadata.name = 'dep2'
-        mock_deployments[1].metadata.namespace = 'namespace2'
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
         runner = CliRunner()
         result = runner.invoke(sre.list)
 
@@ -36,22 +62,28 @@ class TestSRE(unittest.TestCase):
     def test_list_deployments_in_namespace(self, mock_get_k8s_client):
         mock_api = MagicMock()
         mock_get_k8s_client.return_value = mock_api
-        mock_deployments = [
-            MagicMock(metadata=MagicMock(name='dep1', namespace='namespace1')),
-            MagicMock(metadata=MagicMock(name='dep2', namespace='namespace1'))
-        ]
+        mock_deployments = [make_deployment('dep1', 'namespace1'), make_deployment('dep2', 'namespace1')]
         mock_api.list_namespaced_deployment.return_value.items = mock_deployments
-        mock_deployments[0].metadata.name = 'dep1'
-        mock_deployments[0].metadata.namespace = 'namespace1'
-        mock_deployments[1].metadata.name = 'dep2'
-        mock_deployments[1].metadata.namespace = 'namespace1'
+        mock_api.list_namespaced_deployment.return_value.metadata._continue = None
         runner = CliRunner()
         result = runner.invoke(sre.list, ['--namespace', 'namespace1'])
-        mock_api.list_namespaced_deployment.assert_called_once_with(namespace='namespace1')
+        mock_api.list_namespaced_deployment.assert_called_once_with(namespace='namespace1', limit=500, _continue=None)
 
         self.assertIn("Deployment: dep1 Namespace: namespace1", result.output)
         self.assertIn("Deployment: dep2 Namespace: namespace1", result.output)
 
+    def test_iter_deployments_follows_continue_token(self):
+        mock_api = MagicMock()
+        first_page = MagicMock(items=['dep1', 'dep2'])
+        first_page.metadata._continue = 'token'
+        second_page = MagicMock(items=['dep3'])
+        second_page.metadata._continue = None
+        mock_api.list_deployment_for_all_namespaces.side_effect = [first_page, second_page]
+        deployments = [d for d in sre.iter_deployments(mock_api, page=2)]
+
+        self.assertEqual(deployments, ['dep1', 'dep2', 'dep3'])
+        mock_api.list_deployment_for_all_namespaces.assert_called_with(limit=2, _continue='token')
+
     @patch('sre.get_k8s_client')
     def test_scale_deployment(self, mock_get_k8s_client):
         mock_api = MagicMock()
@@ -65,20 +97,62 @@ class TestSRE(unittest.TestCase):
             body={'spec': {'replicas': 5}}
         )
 
+        mock_api.read_namespaced_deployment.assert_not_called()
+
         self.assertIn("Scaled deployment myapp to 5 replicas", result.output)
 
     @patch('sre.get_k8s_client')
-    def test_info_deployment(self, mock_get_k8s_client):
+    def test_scale_deployment_not_found(self, mock_get_k8s_client):
         mock_api = MagicMock()
         mock_get_k8s_client.return_value = mock_api
-        deployment = MagicMock()
-        deployment.metadata.name = "myapp"
-        deployment.metadata.namespace = "mynamespace"
-        deployment.spec.replicas = 3
-        deployment.status.replicas = 3
-        deployment.status.available_replicas = 3
-        deployment.spec.strategy.type = "RollingUpdate"
-        mock_api.read_namespaced_deployment.return_value = deployment
+        mock_api.patch_namespaced_deployment.side_effect = ApiException(status=404, reason="Not Found")
+        runner = CliRunner()
+        result = runner.invoke(sre.scale, ['--deployment', 'myapp', '--replicas', 5, '--namespace', 'mynamespace'])
+
+        self.assertIn("Deployment myapp not found in namespace mynamespace", result.output)
+
+    @patch('sre.get_k8s_client')
+    def test_scale_deployment_without_namespace(self, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('myapp', 'mynamespace')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+        runner = CliRunner()
+        result = runner.invoke(sre.scale, ['--deployment', 'myapp', '--replicas', 2])
+        mock_api.list_deployment_for_all_namespaces.assert_called_once_with(limit=500, _continue=None, field_selector='metadata.name=myapp')
+        mock_api.patch_namespaced_deployment.assert_called_with(
+            name='myapp',
+            namespace='mynamespace',
+            body={'spec': {'replicas': 2}}
+        )
+
+        self.assertIn("Scaled deployment myapp to 2 replicas in namespace mynamespace", result.output)
+
+    @patch('sre.get_k8s_client')
+    def test_scale_deployment_retries_stale_cached_namespace(self, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_api.api_client.configuration.host = 'https://cluster'
+        sre._save_deployment_cache({'https://cluster': {'myapp': {'ts': time.time(), 'namespaces': ['oldns']}}})
+        mock_api.patch_namespaced_deployment.side_effect = [ApiException(status=404), None]
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('myapp', 'ns1'),
+                                                                          make_deployment('myapp', 'ns2')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+        runner = CliRunner()
+        result = runner.invoke(sre.scale, ['--deployment', 'myapp', '--replicas', 2], input='2\n')
+
+        self.assertIn("Multiple deployments have the same name:", result.output)
+        self.assertIn("Scaled deployment myapp to 2 replicas in namespace ns2", result.output)
+        self.assertEqual([c.kwargs['namespace'] for c in mock_api.patch_namespaced_deployment.call_args_list],
+                         ['oldns', 'ns2'])
+        mock_api.list_deployment_for_all_namespaces.assert_called_once()
+
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_info_deployment(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
         runner = CliRunner()
         result = runner.invoke(sre.info, ['--deployment', 'myapp', '--namespace', 'mynamespace'])
 
@@ -87,6 +161,66 @@ class TestSRE(unittest.TestCase):
         self.assertIn("Replicas: 3", result.output)
         self.assertIn("Deployment Strategy: RollingUpdate", result.output)
 
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_info_deployment_without_namespace(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_get_core_client.return_value = MagicMock()
+        deployment = make_deployment("myapp", "mynamespace")
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [deployment]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+        mock_api.read_namespaced_deployment.return_value = deployment
+        runner = CliRunner()
+        result = runner.invoke(sre.info, ['--deployment', 'myapp'])
+
+        self.assertIn("Namespace: mynamespace", result.output)
+        mock_api.read_namespaced_deployment.assert_not_called()
+
+        runner.invoke(sre.info, ['--deployment', 'myapp'])
+        mock_api.list_deployment_for_all_namespaces.assert_called_once()
+        mock_api.read_namespaced_deployment.assert_called_once_with(name='myapp', namespace='mynamespace')
+
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_info_deployment_retries_stale_cached_namespace(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_core_api = mock_get_core_client.return_value
+        mock_api.api_client.configuration.host = 'https://cluster'
+        sre._save_deployment_cache({'https://cluster': {'myapp': {'ts': time.time(), 'namespaces': ['oldns']}}})
+        mock_api.read_namespaced_deployment.side_effect = ApiException(status=404)
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('myapp', 'newns')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+        runner = CliRunner()
+        result = runner.invoke(sre.info, ['--deployment', 'myapp'])
+
+        self.assertIn("Namespace: newns", result.output)
+        self.assertNotIn("not found", result.output)
+        mock_api.read_namespaced_deployment.assert_called_once_with(name='myapp', namespace='oldns')
+        mock_core_api.read_namespaced_service.assert_called_with(name='myapp', namespace='newns')
+        self.assertEqual(sre.resolve_deployment_namespace(mock_api, 'myapp'), ['newns'])
+
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_info_service_and_endpoints(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_core_api = MagicMock()
+        mock_get_core_client.return_value = mock_core_api
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_core_api.read_namespaced_service.side_effect = ApiException(status=404, reason="Not Found")
+        mock_endpoints = MagicMock()
+        mock_endpoints.metadata.name = "myapp"
+        mock_endpoints.subsets = [MagicMock(addresses=[MagicMock(ip="10.0.0.1")])]
+        mock_core_api.read_namespaced_endpoints.return_value = mock_endpoints
+        runner = CliRunner()
+        result = runner.invoke(sre.info, ['--deployment', 'myapp', '--namespace', 'mynamespace'])
+
+        self.assertIn("No service named myapp found in namespace mynamespace", result.output)
+        self.assertIn("- Endpoint: myapp", result.output)
+        self.assertIn("- Address: 10.0.0.1", result.output)
+
 
     @patch('sre.get_k8s_client')
     @patch('sre.get_core_client')
@@ -95,18 +229,8 @@ class TestSRE(unittest.TestCase):
         mock_get_k8s_client.return_value = mock_api
         mock_core_api = MagicMock()
         mock_get_core_client.return_value = mock_core_api
-        mock_deployment = MagicMock()
-        mock_deployment.metadata.name = "myapp"
-        mock_deployment.metadata.namespace = "mynamespace"
-        mock_deployment.spec.replicas = 3
-        mock_deployment.status.replicas = 3
-        mock_deployment.status.available_replicas = 3
-        mock_deployment.spec.template.metadata.labels = {"app": "myapp"}
-        mock_api.read_namespaced_deployment.return_value = mock_deployment
-        mock_pod = MagicMock()
-        mock_pod.metadata.name = "myapp-pod-1"
-        mock_pod.status.phase = "Running"
-        mock_core_api.list_namespaced_pod.return_value.items = [mock_pod]
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_core_api.list_namespaced_pod.return_value.items = [make_pod("myapp-pod-1", "Running")]
         runner = CliRunner()
         result = runner.invoke(sre.diagnostic, ['--deployment', 'myapp', '--namespace', 'mynamespace', '--pod'])
 
@@ -122,5 +246,513 @@ class TestSRE(unittest.TestCase):
 
         self.assertIn("Deployment nonexistent-deployment not found in namespace mynamespace", result.output)
 
+    def clear_client_caches(self):
+        sre._build_api_client.cache_clear()
+        sre.get_k8s_client.cache_clear()
+        sre.get_core_client.cache_clear()
+
+    def test_help_does_not_import_kubernetes(self):
+        script = "import sys, sre; sre.cli(['--help'], standalone_mode=False); print('kubernetes' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False')
+
+    @patch('sre._load_config')
+    @patch('sre.ConfigException', None)
+    @patch('sre.ApiException', None)
+    @patch('sre.config', None)
+    @patch('sre.client', None)
+    def test_clients_import_kubernetes_on_first_use(self, mock_load_config):
+        self.clear_client_caches()
+        self.addCleanup(self.clear_client_caches)
+        apps_api = sre.get_k8s_client()
+
+        self.assertEqual(type(apps_api).__name__, 'AppsV1Api')
+        mock_load_config.assert_called_once()
+
+    @patch('sre._in_cluster', return_value=True)
+    def test_clients_load_config_once(self, mock_in_cluster):
+        sre._import_kubernetes()
+        config_patcher = patch('sre.config')
+        client_patcher = patch('sre.client')
+        mock_config = config_patcher.start()
+        mock_client = client_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        self.addCleanup(client_patcher.stop)
+        self.clear_client_caches()
+        self.addCleanup(self.clear_client_caches)
+        apps_api = sre.get_k8s_client()
+        core_api = sre.get_core_client()
+
+        self.assertIs(sre.get_k8s_client(), apps_api)
+        self.assertIs(sre.get_core_client(), core_api)
+        mock_config.load_incluster_config.assert_called_once_with(client_configuration=mock_client.Configuration.return_value)
+        mock_client.ApiClient.assert_called_once_with(mock_client.Configuration.return_value)
+        self.assertEqual(mock_client.Configuration.return_value.connection_pool_maxsize, 32)
+        mock_client.AppsV1Api.assert_called_once_with(mock_client.ApiClient.return_value)
+        mock_client.CoreV1Api.assert_called_once_with(mock_client.ApiClient.return_value)
+
+    @patch('sre.config')
+    def test_load_config_outside_cluster(self, mock_config):
+        sre._in_cluster.cache_clear()
+        self.addCleanup(sre._in_cluster.cache_clear)
+        configuration = MagicMock()
+        with patch('sre._SERVICE_ACCOUNT_TOKEN', os.path.join(self.tmp_dir, 'token')):
+            sre._load_config(configuration)
+
+        mock_config.load_kube_config.assert_called_once_with(client_configuration=configuration)
+        mock_config.load_incluster_config.assert_not_called()
+
+    def test_in_cluster_requires_service_env(self):
+        sre._in_cluster.cache_clear()
+        self.addCleanup(sre._in_cluster.cache_clear)
+        token = os.path.join(self.tmp_dir, 'token')
+        open(token, 'w').close()
+        environ = {k: v for k, v in os.environ.items() if not k.startswith('KUBERNETES_SERVICE_')}
+        with patch('sre._SERVICE_ACCOUNT_TOKEN', token), patch.dict(os.environ, environ, clear=True):
+            self.assertFalse(sre._in_cluster())
+            sre._in_cluster.cache_clear()
+            os.environ.update(KUBERNETES_SERVICE_HOST='10.0.0.1', KUBERNETES_SERVICE_PORT='443')
+            self.assertTrue(sre._in_cluster())
+
+    @patch('sre._HAS_KUBERNETES_ASYNCIO', False)
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_logs_for_deployment_pods(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_core_api = MagicMock()
+        mock_get_core_client.return_value = mock_core_api
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_core_api.list_namespaced_pod.return_value.items = [make_pod(f"myapp-pod-{i}", "Running") for i in (1, 2)]
+        mock_core_api.read_namespaced_pod_log.return_value.stream.return_value = [b"hel", b"lo"]
+        runner = CliRunner()
+        result = runner.invoke(sre.logs, ['--deployment', 'myapp', '--namespace', 'mynamespace', '--concurrency', 2])
+
+        self.assertEqual(mock_core_api.read_namespaced_pod_log.call_count, 2)
+        self.assertEqual(mock_core_api.read_namespaced_pod_log.return_value.release_conn.call_count, 2)
+        self.assertIn("Logs for pod myapp-pod-1 (namespace: mynamespace):\nhello", result.output)
+        self.assertIn("Logs for pod myapp-pod-2 (namespace: mynamespace):\nhello", result.output)
+        self.assertLess(result.output.index("myapp-pod-1"), result.output.index("myapp-pod-2"))
+
+    @patch('sre._HAS_KUBERNETES_ASYNCIO', False)
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_logs_concurrency_bounds_open_responses(self, mock_get_core_client, mock_get_k8s_client):
+        mock_get_k8s_client.return_value.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_core_api = mock_get_core_client.return_value
+        mock_core_api.list_namespaced_pod.return_value.items = [make_pod(f"myapp-pod-{i}", "Running") for i in range(6)]
+        lock = threading.Lock()
+        open_responses = []
+        peak = []
+
+        def read_log(**kwargs):
+            resp = MagicMock()
+            resp.stream.return_value = [b"line\n"]
+            resp.release_conn.side_effect = lambda: open_responses.remove(resp)
+            with lock:
+                open_responses.append(resp)
+                peak.append(len(open_responses))
+            return resp
+        mock_core_api.read_namespaced_pod_log.side_effect = read_log
+        runner = CliRunner()
+        result = runner.invoke(sre.logs, ['--deployment', 'myapp', '--namespace', 'mynamespace', '--concurrency', 2])
+
+        self.assertEqual(mock_core_api.read_namespaced_pod_log.call_count, 6)
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(open_responses, [])
+        self.assertEqual(result.output.count("line\n"), 6)
+
+    def test_resolve_deployment_namespace_uses_cache(self):
+        mock_api = MagicMock()
+        mock_api.api_client.configuration.host = 'https://cluster'
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('myapp', 'mynamespace')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+
+        self.assertEqual(sre.resolve_deployment_namespace(mock_api, 'myapp'), ['mynamespace'])
+        self.assertEqual(sre.resolve_deployment_namespace(mock_api, 'myapp'), ['mynamespace'])
+        mock_api.list_deployment_for_all_namespaces.assert_called_once()
+
+        with patch('sre.time.time', return_value=time.time() + sre._DEPLOYMENT_CACHE_TTL):
+            sre.resolve_deployment_namespace(mock_api, 'myapp')
+        self.assertEqual(mock_api.list_deployment_for_all_namespaces.call_count, 2)
+
+        sre.invalidate_deployment_namespace(mock_api, 'myapp')
+        sre.resolve_deployment_namespace(mock_api, 'myapp')
+        self.assertEqual(mock_api.list_deployment_for_all_namespaces.call_count, 3)
+
+    def test_save_deployment_cache_drops_expired_entries(self):
+        now = time.time()
+        sre._save_deployment_cache({
+            'https://cluster': {'fresh': {'ts': now, 'namespaces': ['ns1']},
+                                'stale': {'ts': now - sre._DEPLOYMENT_CACHE_TTL, 'namespaces': ['ns2']}},
+            'https://gone': {'old': {'ts': now - sre._DEPLOYMENT_CACHE_TTL, 'namespaces': ['ns3']}}})
+
+        self.assertEqual(sre._load_deployment_cache(), {'https://cluster': {'fresh': {'ts': now, 'namespaces': ['ns1']}}})
+        self.assertEqual(os.listdir(self.tmp_dir), ['deployments.json'])
+
+    def test_resolve_deployment_namespace_ignores_malformed_cache(self):
+        mock_api = MagicMock()
+        mock_api.api_client.configuration.host = 'https://cluster'
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('myapp', 'mynamespace')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+        now = time.time()
+        for cache in ([], {'https://cluster': []}, {'https://cluster': {'myapp': {'namespaces': ['stale']}}},
+                      {'https://cluster': {'myapp': 'stale'}, 'https://other': {'dep': {'ts': 'now'}}},
+                      {'https://cluster': {'myapp': {'ts': now, 'namespaces': []}}},
+                      {'https://cluster': {'myapp': {'ts': now, 'namespaces': [None]}}}):
+            with open(sre._DEPLOYMENT_CACHE_FILE, 'w') as f:
+                json.dump(cache, f)
+
+            self.assertEqual(sre.resolve_deployment_namespace(mock_api, 'myapp'), ['mynamespace'])
+        self.assertEqual(mock_api.list_deployment_for_all_namespaces.call_count, 6)
+        self.assertEqual(sre.resolve_deployment_namespace(mock_api, 'myapp'), ['mynamespace'])
+        self.assertEqual(mock_api.list_deployment_for_all_namespaces.call_count, 6)
+
+    def test_log_batch_written_at_once(self):
+        file_handler = sre.SharedRotatingFileHandler(os.path.join(self.tmp_dir, 'sre_cli.log'), maxBytes=1000, delay=True)
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+        file_handler.stream = MagicMock()
+        file_handler.stream.tell.return_value = 0
+        memory_handler = sre.BatchMemoryHandler(capacity=3, target=file_handler)
+        for i in range(3):
+            memory_handler.handle(logging.makeLogRecord({'msg': f'record {i}', 'levelno': logging.INFO}))
+
+        file_handler.stream.write.assert_called_once_with("record 0\nrecord 1\nrecord 2\n")
+        self.assertEqual(memory_handler.buffer, [])
+
+    @patch('sre.get_core_client')
+    def test_list_pods_uses_watch_cache(self, mock_get_core_client):
+        mock_core_api = MagicMock()
+        mock_get_core_client.return_value = mock_core_api
+        mock_core_api.list_namespaced_pod.return_value.items = ['pod1']
+
+        self.assertEqual(sre._list_pods('mynamespace', 'app=myapp'), ['pod1'])
+        mock_core_api.list_namespaced_pod.assert_called_once_with(namespace='mynamespace', label_selector='app=myapp',
+                                                              resource_version='0', _request_timeout=10)
+
+    @patch('sre._HAS_KUBERNETES_ASYNCIO', True)
+    @patch('sre.fetch_pods_logs_async')
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_logs_for_deployment_pods_async(self, mock_get_core_client, mock_get_k8s_client, mock_fetch_pods_logs_async):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_core_api = MagicMock()
+        mock_get_core_client.return_value = mock_core_api
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_core_api.list_namespaced_pod.return_value.items = [make_pod(f"myapp-pod-{i}", "Running") for i in (1, 2)]
+        runner = CliRunner()
+        runner.invoke(sre.logs, ['--deployment', 'myapp', '--namespace', 'mynamespace'])
+
+        mock_fetch_pods_logs_async.assert_called_once_with(['myapp-pod-1', 'myapp-pod-2'], 'mynamespace', 50, 6)
+        mock_core_api.read_namespaced_pod_log.assert_not_called()
+
+    @unittest.skipUnless(importlib.util.find_spec('kubernetes_asyncio'), 'kubernetes_asyncio not installed')
+    @patch('sre._HAS_KUBERNETES_ASYNCIO', True)
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    @patch('sre._get_api_client')
+    def test_logs_async_streams_in_order(self, mock_get_api_client, mock_get_core_client, mock_get_k8s_client):
+        sre._import_kubernetes()
+        mock_get_k8s_client.return_value.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_get_core_client.return_value.list_namespaced_pod.return_value.items = [
+            make_pod(f"myapp-pod-{i}", "Running") for i in (1, 2, 3)]
+        mock_get_api_client.return_value.configuration = sre.client.Configuration(host="https://cluster.invalid")
+        responses = {}
+
+        class LogResponse:
+            def __init__(self, status, chunks):
+                self.status, self.reason, self.chunks = status, "Not Found", chunks
+                self.content = SimpleNamespace(iter_chunked=self.iter_chunked)
+                self.released = False
+
+            async def iter_chunked(self, size):
+                for chunk in self.chunks:
+                    yield chunk
+
+            async def text(self):
+                return "pods not found"
+
+            def release(self):
+                self.released = True
+
+        async def read_log(name, **kwargs):
+            responses[name] = LogResponse(404, []) if name == "myapp-pod-2" else LogResponse(200, [b"hel", b"lo"])
+            return responses[name]
+
+        with patch('kubernetes_asyncio.client.CoreV1Api') as mock_core_api_cls:
+            mock_core_api_cls.return_value.read_namespaced_pod_log.side_effect = read_log
+            runner = CliRunner()
+            result = runner.invoke(sre.logs, ['--deployment', 'myapp', '--namespace', 'mynamespace', '--concurrency', 2])
+
+        configuration = mock_core_api_cls.call_args[0][0].configuration
+        self.assertEqual(configuration.host, "https://cluster.invalid")
+        self.assertIn("Logs for pod myapp-pod-1 (namespace: mynamespace):\nhello\n"
+                      "Could not retrieve logs for pod myapp-pod-2: (404)", result.output)
+        self.assertIn("Logs for pod myapp-pod-3 (namespace: mynamespace):\nhello\n", result.output)
+        self.assertTrue(all(resp.released for resp in responses.values()))
+        mock_get_core_client.return_value.read_namespaced_pod_log.assert_not_called()
+
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_pod_status_check_pending_pods(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_core_api = MagicMock()
+        mock_get_core_client.return_value = mock_core_api
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        mock_core_api.list_namespaced_pod.return_value.items = [make_pod(f"myapp-pod-{i}", "Pending") for i in (1, 2)]
+        runner = CliRunner()
+        result = runner.invoke(sre.diagnostic, ['--deployment', 'myapp', '--namespace', 'mynamespace', '--pod'])
+
+        self.assertIn("Pod myapp-pod-1 is in Pending state.", result.output)
+        self.assertIn("Pod myapp-pod-2 is in Pending state.", result.output)
+        self.assertNotIn("An unexpected error occurred", result.output)
+
+    @patch('sre.get_k8s_client')
+    @patch('sre.get_core_client')
+    def test_pod_status_check_containers(self, mock_get_core_client, mock_get_k8s_client):
+        mock_api = MagicMock()
+        mock_get_k8s_client.return_value = mock_api
+        mock_core_api = MagicMock()
+        mock_get_core_client.return_value = mock_core_api
+        mock_api.read_namespaced_deployment.return_value = make_deployment("myapp", "mynamespace")
+        app, sidecar = MagicMock(), MagicMock()
+        app.name, sidecar.name = "app", "sidecar"
+        app.resources.requests = {"cpu": "100m", "memory": "64Mi"}
+        app.resources.limits = None
+        sidecar.resources.requests = None
+        sidecar.resources.limits = {"cpu": "50m"}
+        sidecar_status = MagicMock()
+        sidecar_status.name = "sidecar"
+        sidecar_status.state.waiting.reason = "CrashLoopBackOff"
+        mock_core_api.list_namespaced_pod.return_value.items = [
+            make_pod("myapp-pod-1", "Running", containers=[app, sidecar], container_statuses=[sidecar_status])]
+        runner = CliRunner()
+        result = runner.invoke(sre.diagnostic, ['--deployment', 'myapp', '--namespace', 'mynamespace', '--pod'])
+
+        self.assertIn("CPU Request: 100m\nMemory Request: 64Mi\n"
+                      "Container: sidecar - Waiting due to: CrashLoopBackOff\n"
+                      "CPU Limit: 50m\nMemory Limit: N/A", result.output)
+
+    def run_via_daemon(self, args, stdin='', kubeconfig=None):
+        socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        server = socketserver.UnixStreamServer(socket_path, sre._DaemonHandler)
+        server.kubeconfig = kubeconfig or sre._kubeconfig_identity()
+        self.addCleanup(server.server_close)
+        thread = threading.Thread(target=server.handle_request, daemon=True)
+        thread.start()
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stderr = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stdin = io.StringIO(stdin) if isinstance(stdin, str) else stdin
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr), patch('sys.stdin', stdin):
+            exit_code = sre._run_via_daemon(args, socket_path)
+        thread.join(5)
+        return exit_code, stdout.buffer.getvalue(), stderr.buffer.getvalue()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.get_k8s_client')
+    def test_daemon_runs_command(self, mock_get_k8s_client):
+        mock_api = mock_get_k8s_client.return_value
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('dep1', 'namespace1')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+
+        exit_code, stdout, stderr = self.run_via_daemon(['list'])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, b"Deployment: dep1 Namespace: namespace1\n")
+        self.assertEqual(stderr, b"")
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    def test_daemon_forwards_stderr(self):
+        exit_code, stdout, stderr = self.run_via_daemon(['logs', '--namespace', 'mynamespace'])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, b"")
+        self.assertEqual(stderr, b"You must specify either --deployment or --pod.\n")
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.get_core_client')
+    def test_daemon_streams_log_bytes(self, mock_get_core_client):
+        mock_get_core_client.return_value.read_namespaced_pod_log.return_value.stream.return_value = [b"\xff\xfe", b"raw\n"]
+
+        exit_code, stdout, stderr = self.run_via_daemon(['logs', '--pod', 'mypod', '--namespace', 'mynamespace'])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, b"Logs for pod mypod (namespace: mynamespace):\n\xff\xferaw\n")
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.get_k8s_client')
+    @patch('sre._find_deployments')
+    def test_daemon_forwards_prompts(self, mock_find, mock_get_k8s_client):
+        mock_find.return_value = [make_deployment('myapp', 'ns1'), make_deployment('myapp', 'ns2')]
+
+        exit_code, stdout, stderr = self.run_via_daemon(['scale', '--replicas', '2', '--deployment', 'myapp'], stdin='2\n')
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn(b"Enter the number of the namespace to scale: ", stdout)
+        mock_get_k8s_client.return_value.patch_namespaced_deployment.assert_called_once_with(
+            name='myapp', namespace='ns2', body={'spec': {'replicas': 2}})
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.get_k8s_client')
+    @patch('sre._find_deployments')
+    def test_daemon_serves_other_callers_during_prompt(self, mock_find, mock_get_k8s_client):
+        mock_find.return_value = [make_deployment('myapp', 'ns1'), make_deployment('myapp', 'ns2')]
+        mock_api = mock_get_k8s_client.return_value
+        mock_api.list_deployment_for_all_namespaces.return_value.items = [make_deployment('dep1', 'namespace1')]
+        mock_api.list_deployment_for_all_namespaces.return_value.metadata._continue = None
+        for name in ('stdin', 'stdout', 'stderr'):
+            self.addCleanup(setattr, sys, name, getattr(sys, name))
+        socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        server = sre._DaemonServer(socket_path, sre._DaemonHandler)
+        server.kubeconfig = sre._kubeconfig_identity()
+        self.addCleanup(server.server_close)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+
+        def send(args):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.addCleanup(sock.close)
+            sock.settimeout(5)
+            sock.connect(socket_path)
+            f = sock.makefile('rwb')
+            self.addCleanup(f.close)
+            f.write(json.dumps({"args": args, "kubeconfig": server.kubeconfig}).encode('utf-8') + b"\n")
+            f.flush()
+            return f
+
+        def read_until_exit(f):
+            stdout = b""
+            while True:
+                kind, payload = sre._read_frame(f)
+                if kind == b"o":
+                    stdout += payload
+                elif kind == b"x":
+                    return int(payload), stdout
+
+        prompting = send(['scale', '--replicas', '2', '--deployment', 'myapp'])
+        while sre._read_frame(prompting)[0] != b"i":
+            pass
+        self.assertEqual(read_until_exit(send(['list'])), (0, b"Deployment: dep1 Namespace: namespace1\n"))
+
+        prompting.write(b'"2\\n"\n')
+        prompting.flush()
+        exit_code, stdout = read_until_exit(prompting)
+        self.assertEqual(exit_code, 0)
+        self.assertIn(b"Scaled deployment myapp to 2 replicas in namespace ns2", stdout)
+        mock_api.patch_namespaced_deployment.assert_called_once_with(
+            name='myapp', namespace='ns2', body={'spec': {'replicas': 2}})
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.buffered_log_handler')
+    def test_daemon_flushes_log_records_per_command(self, mock_buffered_log_handler):
+        self.run_via_daemon(['logs', '--namespace', 'mynamespace'])
+
+        mock_buffered_log_handler.flush.assert_called_once()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.get_k8s_client')
+    @patch('sre._find_deployments')
+    def test_daemon_client_interrupted_at_prompt(self, mock_find, mock_get_k8s_client):
+        mock_find.return_value = [make_deployment('myapp', 'ns1'), make_deployment('myapp', 'ns2')]
+        stdin = MagicMock()
+        stdin.readline.side_effect = KeyboardInterrupt
+
+        exit_code, stdout, stderr = self.run_via_daemon(['scale', '--replicas', '2', '--deployment', 'myapp'], stdin=stdin)
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(stderr, b"Aborted!\n")
+        mock_get_k8s_client.return_value.patch_namespaced_deployment.assert_not_called()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    def test_run_via_daemon_unexpected_frame(self):
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.rfile.readline()
+                sre._write_frame(self.wfile, b"o", b"partial\n")
+                sre._write_frame(self.wfile, b"?")
+
+        socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+        self.addCleanup(server.server_close)
+        threading.Thread(target=server.handle_request, daemon=True).start()
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stderr = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr):
+            exit_code = sre._run_via_daemon(['list'], socket_path)
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(stdout.buffer.getvalue(), b"partial\n")
+        self.assertIn(b"Unexpected reply from the sre.py daemon", stderr.buffer.getvalue())
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre.get_k8s_client')
+    def test_daemon_refuses_other_kubeconfig(self, mock_get_k8s_client):
+        exit_code, stdout, stderr = self.run_via_daemon(['list'], kubeconfig={"in_cluster": False, "kubeconfig": []})
+
+        self.assertIsNone(exit_code)
+        self.assertEqual((stdout, stderr), (b"", b""))
+        mock_get_k8s_client.assert_not_called()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre._get_api_client')
+    def test_daemon_keeps_running_daemon_socket(self, mock_get_api_client):
+        socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        server = socketserver.UnixStreamServer(socket_path, sre._DaemonHandler)
+        self.addCleanup(server.server_close)
+        runner = CliRunner()
+        result = runner.invoke(sre.daemon, env={'SRE_DAEMON_SOCKET': socket_path})
+
+        self.assertIn(f"An sre.py daemon is already serving {socket_path}.", result.output)
+        self.assertTrue(os.path.exists(socket_path))
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    def test_daemon_running_ignores_stale_socket(self):
+        socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        socketserver.UnixStreamServer(socket_path, sre._DaemonHandler).server_close()
+
+        self.assertTrue(os.path.exists(socket_path))
+        self.assertFalse(sre._daemon_running(socket_path))
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    def test_daemon_ignores_probes_and_malformed_requests(self):
+        socket_path = os.path.join(self.tmp_dir, 'daemon.sock')
+        server = socketserver.UnixStreamServer(socket_path, sre._DaemonHandler)
+        server.handle_error = MagicMock()
+        self.addCleanup(server.server_close)
+        for request in (b"", b"not json\n", b"[]\n"):
+            thread = threading.Thread(target=server.handle_request, daemon=True)
+            thread.start()
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+                sock.sendall(request)
+            thread.join(5)
+
+        server.handle_error.assert_not_called()
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'UNIX sockets required')
+    @patch('sre._get_api_client')
+    def test_daemon_socket_from_env(self, mock_get_api_client):
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp_dir)
+        socket_path = 'rel.sock'
+        server = socketserver.UnixStreamServer(socket_path, sre._DaemonHandler)
+        self.addCleanup(server.server_close)
+        threading.Thread(target=server.handle_request, daemon=True).start()
+        runner = CliRunner()
+        result = runner.invoke(sre.daemon, env={'SRE_DAEMON_SOCKET': socket_path})
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn(f"An sre.py daemon is already serving {socket_path}.", result.output)
+        with patch.dict(os.environ, {'SRE_DAEMON_SOCKET': socket_path}):
+            self.assertEqual(sre._daemon_socket(), socket_path)
+        self.assertEqual(sre._daemon_socket(), sre._DAEMON_SOCKET)
+
+    def test_run_via_daemon_without_socket(self):
+        self.assertIsNone(sre._run_via_daemon(['list'], os.path.join(self.tmp_dir, 'missing.sock')))
+
 if __name__ == '__main__':
     unittest.main()